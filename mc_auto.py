@@ -12,17 +12,30 @@ or by running `python3 mc_auto.py /home/container 512M 1G <jar_url>`.
 
 from __future__ import annotations
 
+import http.client
 import json
 import os
+import re
 import shutil
 import socket
 import subprocess
 import sys
 import tarfile
 import tempfile
-from urllib.request import Request, urlopen
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from urllib.parse import urljoin, urlsplit
+from urllib.request import Request, getproxies, proxy_bypass, urlopen
 from urllib.error import URLError, HTTPError
 
+try:
+    from orjson import loads as json_loads
+except ImportError:  # optional; stdlib json.loads accepts bytes as well
+    from json import loads as json_loads
+
+USER_AGENT = "mc_auto/1.0"
+
 
 def eprint(*args, **kwargs):
     print(*args, file=sys.stderr, **kwargs)
@@ -32,26 +45,235 @@ def ensure_dir(path: str) -> None:
     os.makedirs(path, exist_ok=True)
 
 
-def download_stream(url: str, dest: str, chunk: int = 8192) -> None:
+# Idle keep-alive connections keyed by (scheme, netloc). A connection is
+# checked out while its response is being read and only returned once the
+# body has been fully consumed, so it is safe to share between threads.
+_pool: dict[tuple[str, str], list[http.client.HTTPConnection]] = {}
+_pool_lock = threading.Lock()
+_REDIRECTS = (301, 302, 303, 307, 308)
+
+
+# getaddrinfo results per (host, port), so each host is resolved once per run
+_dns_cache: dict[tuple[str, int], list] = {}
+
+
+def _cached_create_connection(address: tuple[str, int], timeout: float | None = None, source_address=None) -> socket.socket:
+    host, port = address
+    infos = _dns_cache.get((host, port))
+    if infos is None:
+        infos = socket.getaddrinfo(host, port, 0, socket.SOCK_STREAM)
+        _dns_cache[(host, port)] = infos
+    err = None
+    for family, type_, proto, _, sockaddr in infos:
+        sock = socket.socket(family, type_, proto)
+        try:
+            sock.settimeout(timeout)
+            if source_address:
+                sock.bind(source_address)
+            sock.connect(sockaddr)
+            return sock
+        except OSError as ex:
+            err = ex
+            sock.close()
+    # none of the cached addresses worked; resolve again next time
+    _dns_cache.pop((host, port), None)
+    raise err or OSError(f"no addresses for {host}")
+
+
+class _HTTPConnection(http.client.HTTPConnection):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._create_connection = _cached_create_connection
+
+
+class _HTTPSConnection(http.client.HTTPSConnection):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._create_connection = _cached_create_connection
+
+
+def _new_conn(key: tuple[str, str], timeout: float) -> http.client.HTTPConnection:
+    scheme, netloc = key
+    if scheme == "https":
+        return _HTTPSConnection(netloc, timeout=timeout)
+    return _HTTPConnection(netloc, timeout=timeout)
+
+
+def _checkout(key: tuple[str, str], timeout: float) -> tuple[http.client.HTTPConnection, bool]:
+    with _pool_lock:
+        idle = _pool.get(key)
+        if idle:
+            conn = idle.pop()
+            conn.timeout = timeout
+            if conn.sock is not None:
+                conn.sock.settimeout(timeout)
+            return conn, True
+    return _new_conn(key, timeout), False
+
+
+def _checkin(key: tuple[str, str], conn: http.client.HTTPConnection) -> None:
+    with _pool_lock:
+        idle = _pool.setdefault(key, [])
+        if len(idle) < 4:
+            idle.append(conn)
+            return
+    conn.close()
+
+
+class PooledResponse:
+    """File-like HTTP response that hands its connection back to the pool on close."""
+
+    def __init__(self, resp: http.client.HTTPResponse, key: tuple[str, str], conn: http.client.HTTPConnection):
+        self._resp = resp
+        self._key = key
+        self._conn = conn
+        self.status = resp.status
+        self.headers = resp.headers
+
+    def read(self, amt: int | None = None) -> bytes:
+        return self._resp.read(amt)
+
+    def readinto(self, b) -> int:
+        return self._resp.readinto(b)
+
+    def close(self) -> None:
+        if self._conn is None:
+            return
+        conn, self._conn = self._conn, None
+        if self._resp.length == 0:
+            self._resp.read()  # HEAD / empty bodies: mark the response as drained
+        # only a fully drained, keep-alive response leaves the connection reusable
+        if self._resp.isclosed() and not self._resp.will_close:
+            _checkin(self._key, conn)
+        else:
+            self._resp.close()
+            conn.close()
+
+    def __enter__(self) -> "PooledResponse":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def _request(key: tuple[str, str], method: str, path: str, timeout: float):
+    conn, reused = _checkout(key, timeout)
+    try:
+        conn.request(method, path, headers={"User-Agent": USER_AGENT})
+        return conn, conn.getresponse()
+    except (http.client.HTTPException, OSError):
+        conn.close()
+        if not reused:
+            raise
+    # the server dropped an idle keep-alive connection; retry once on a fresh one
+    conn = _new_conn(key, timeout)
+    try:
+        conn.request(method, path, headers={"User-Agent": USER_AGENT})
+        return conn, conn.getresponse()
+    except Exception:
+        conn.close()
+        raise
+
+
+def _needs_proxy(scheme: str, host: str) -> bool:
+    return bool(getproxies().get(scheme)) and not proxy_bypass(host)
+
+
+def http_open(url: str, timeout: float = 60, method: str = "GET", max_redirects: int = 5):
+    """Open `url` over a pooled keep-alive connection, following redirects.
+
+    Raises HTTPError for 4xx/5xx responses and URLError for connection failures,
+    mirroring `urllib.request.urlopen`. Other schemes (file://, ftp://) and hosts
+    reached through an HTTP(S)_PROXY (honouring NO_PROXY) are handed to `urlopen`
+    instead of the pool.
+    """
+    for _ in range(max_redirects + 1):
+        parts = urlsplit(url)
+        if parts.scheme not in ("http", "https") or _needs_proxy(parts.scheme, parts.hostname or ""):
+            return urlopen(Request(url, method=method, headers={"User-Agent": USER_AGENT}), timeout=timeout)
+        key = (parts.scheme, parts.netloc)
+        path = parts.path or "/"
+        if parts.query:
+            path += "?" + parts.query
+        try:
+            conn, resp = _request(key, method, path, timeout)
+        except (http.client.HTTPException, OSError) as ex:
+            raise URLError(ex)
+        if resp.status in _REDIRECTS and resp.getheader("Location"):
+            location = resp.getheader("Location")
+            resp.read()
+            PooledResponse(resp, key, conn).close()
+            url = urljoin(url, location)
+            continue
+        if resp.status >= 400:
+            msg, hdrs = resp.reason, resp.headers
+            resp.read()
+            PooledResponse(resp, key, conn).close()
+            raise HTTPError(url, resp.status, msg, hdrs, None)
+        return PooledResponse(resp, key, conn)
+    raise URLError(f"too many redirects for {url}")
+
+
+def download_stream(url: str, dest: str, chunk: int = 1 << 20) -> None:
     eprint(f"Downloading {url} -> {dest}")
-    req = Request(url, headers={"User-Agent": "mc_auto/1.0"})
     try:
-        with urlopen(req, timeout=60) as r, open(dest, "wb") as f:
-            while True:
-                b = r.read(chunk)
-                if not b:
-                    break
-                f.write(b)
+        with http_open(url, timeout=60) as r, open(dest, "wb") as f:
+            # copy in large blocks; small reads make the Python loop the bottleneck
+            shutil.copyfileobj(r, f, length=chunk)
     except HTTPError as ex:
         raise RuntimeError(f"HTTP error {ex.code} when downloading {url}")
     except URLError as ex:
         raise RuntimeError(f"URL error {ex} when downloading {url}")
 
 
-def safe_extract_tar_gz(archive: str, dest: str) -> None:
+def _inside(path: str, root: str) -> bool:
+    path = os.path.realpath(path)
+    return path == root or path.startswith(root + os.sep)
+
+
+def _extract_symlink(member: tarfile.TarInfo, member_path: str, root: str) -> None:
+    target = member.linkname
+    # only relative links that resolve inside the extraction root
+    if os.path.isabs(target) or not _inside(os.path.join(os.path.dirname(member_path), target), root):
+        eprint(f"Skipping unsafe symlink {member.name} -> {target}")
+        return
+    if os.path.lexists(member_path):
+        os.remove(member_path)
+    os.symlink(target, member_path)
+
+
+def _extract_hardlink(member: tarfile.TarInfo, member_path: str, dest: str, root: str) -> None:
+    # hardlink names are relative to the archive root and refer to an earlier member
+    target = member.linkname
+    if target.startswith("/") or ".." in target.split("/"):
+        eprint(f"Skipping unsafe hardlink {member.name} -> {target}")
+        return
+    source = os.path.join(dest, target)
+    if not _inside(source, root) or not os.path.isfile(source):
+        eprint(f"Skipping hardlink {member.name}: target {target} not extracted")
+        return
+    if os.path.lexists(member_path):
+        os.remove(member_path)
+    try:
+        os.link(source, member_path)
+    except OSError:
+        shutil.copy2(source, member_path)
+
+
+def safe_extract_tar_gz(archive, dest: str) -> str | None:
     # extract into dest safely (no chown, no absolute paths)
-    with tarfile.open(archive, "r:gz") as t:
-        for member in t.getmembers():
+    # `archive` is a path or a readable file object (e.g. an HTTP response);
+    # members are read sequentially so extraction can overlap the download.
+    # Returns the path of the first `bin/java` seen, so callers need not walk dest.
+    if isinstance(archive, str):
+        t = tarfile.open(archive, "r|gz")
+    else:
+        t = tarfile.open(fileobj=archive, mode="r|gz")
+    made_dirs: set[str] = set()
+    java_bin = None
+    root = os.path.realpath(dest)
+    with t:
+        for member in t:
             name = member.name
             if name.startswith("/"):
                 # skip absolute paths
@@ -60,26 +282,90 @@ def safe_extract_tar_gz(archive: str, dest: str) -> None:
                 continue
             member_path = os.path.join(dest, name)
             if member.isdir():
-                ensure_dir(member_path)
+                if member_path not in made_dirs:
+                    ensure_dir(member_path)
+                    made_dirs.add(member_path)
             else:
-                ensure_dir(os.path.dirname(member_path))
+                parent = os.path.dirname(member_path)
+                if parent not in made_dirs:
+                    ensure_dir(parent)
+                    made_dirs.add(parent)
+                # streaming mode cannot extractfile() links, so recreate them here
+                if member.issym():
+                    _extract_symlink(member, member_path, root)
+                    continue
+                if member.islnk():
+                    _extract_hardlink(member, member_path, dest, root)
+                    continue
+                if not member.isfile():
+                    # devices / fifos have no business in a JRE
+                    continue
                 f = t.extractfile(member)
                 if f is None:
                     continue
                 with open(member_path, "wb") as out:
-                    shutil.copyfileobj(f, out)
+                    shutil.copyfileobj(f, out, length=1 << 20)
                 # set executable bit for bin/*
                 if os.path.basename(member_path) in ("java", "javac"):
                     try:
                         os.chmod(member_path, 0o755)
                     except Exception:
                         pass
+                    if java_bin is None and name.split("/")[-2:] == ["bin", "java"]:
+                        java_bin = member_path
+    return java_bin
+
+
+def _fast_copy(src: str, dst: str) -> str:
+    # copytree copy_function: copy in-kernel with copy_file_range, else fall back to copy2
+    copy_range = getattr(os, "copy_file_range", None)
+    if copy_range is None:
+        return shutil.copy2(src, dst)
+    try:
+        with open(src, "rb") as fs, open(dst, "wb") as fd:
+            remaining = os.fstat(fs.fileno()).st_size
+            while remaining > 0:
+                n = copy_range(fs.fileno(), fd.fileno(), remaining)
+                if n == 0:
+                    # some filesystems return 0 before EOF; never keep a short copy
+                    break
+                remaining -= n
+    except OSError:
+        return shutil.copy2(src, dst)
+    if remaining > 0:
+        return shutil.copy2(src, dst)
+    shutil.copymode(src, dst)
+    return dst
+
+
+def move_tree(src: str, dst: str) -> None:
+    """Move a directory; a plain rename on the same filesystem, a fast copy otherwise."""
+    try:
+        same_fs = os.stat(src).st_dev == os.stat(os.path.dirname(os.path.abspath(dst))).st_dev
+    except OSError:
+        same_fs = False
+    if same_fs:
+        shutil.move(src, dst)
+        return
+    shutil.copytree(src, dst, symlinks=True, copy_function=_fast_copy)
+    shutil.rmtree(src, ignore_errors=True)
 
 
 def find_java_in_tree(path: str) -> str | None:
     """Search a directory tree for an executable `java` binary and return its path."""
     if not path or not os.path.exists(path):
         return None
+    # JREs we extract always have this layout; only walk the tree on a miss
+    candidate = os.path.join(path, "bin", "java")
+    if os.access(candidate, os.X_OK):
+        return candidate
+    # archives usually unpack to a single top-level dir, e.g. jdk-21.0.1+12-jre/bin/java
+    with os.scandir(path) as it:
+        for entry in it:
+            if entry.is_dir():
+                candidate = os.path.join(entry.path, "bin", "java")
+                if os.access(candidate, os.X_OK):
+                    return candidate
     for root, dirs, files in os.walk(path):
         if "java" in files:
             candidate = os.path.join(root, "java")
@@ -88,47 +374,94 @@ def find_java_in_tree(path: str) -> str | None:
     return None
 
 
+def _first_success(fn, items: list):
+    """Run `fn` on every item concurrently and return the first truthy result.
+
+    Exceptions count as failures; returns None if every call fails. Stragglers
+    are abandoned rather than awaited.
+    """
+    pool = ThreadPoolExecutor(max_workers=len(items))
+    try:
+        pending = {pool.submit(fn, item) for item in items}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for fut in done:
+                try:
+                    result = fut.result()
+                except Exception:
+                    continue
+                if result:
+                    return result
+        return None
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _probe_mirror(url: str) -> str:
+    with http_open(url, timeout=3, method="HEAD") as r:
+        length = r.headers.get("Content-Length")
+    # a JRE archive is tens of MB; anything tiny is an error page
+    if length is not None and int(length) < 1 << 20:
+        raise RuntimeError(f"implausible Content-Length {length} from {url}")
+    return url
+
+
+def race_mirrors(urls: list[str]) -> str | None:
+    """HEAD all `urls` in parallel and return the first one that answers with a plausible archive."""
+    return _first_success(_probe_mirror, urls)
+
+
 def download_portable_jre_try(tmp_base: str, install_dir: str | None = None) -> str:
     # Try multiple sources; return path to java binary
     # Try newer Java 21+ builds first (some server jars require newer class versions),
     # then fall back to Java 17 if 21 isn't available.
-    candidates = [
+    candidates_21 = [
         # Adoptium Temurin 21 (API latest binary)
         "https://api.adoptium.net/v3/binary/latest/21/ga/linux/x64/jre/hotspot/normal/eclipse?project=jdk",
         # Temurin 21 direct release artifact
         "https://github.com/adoptium/temurin21-binaries/releases/latest/download/OpenJDK21U-jre_x64_linux_hotspot.tar.gz",
         # Liberica 21
         "https://github.com/bell-sw/liberica-releases/releases/latest/download/liberica-jre-21-linux-amd64.tar.gz",
+    ]
+    candidates_17 = [
         # Fall back to Temurin 17 options
         "https://api.adoptium.net/v3/binary/latest/17/ga/linux/x64/jre/hotspot/normal/eclipse?project=jdk",
         "https://github.com/adoptium/temurin17-binaries/releases/latest/download/OpenJDK17U-jre_x64_linux_hotspot.tar.gz",
         "https://github.com/bell-sw/liberica-releases/releases/latest/download/liberica-jre-17-linux-amd64.tar.gz",
     ]
+    # Race the Java 21 mirrors and try the first responder first, so a dead CDN costs
+    # a few seconds instead of a full download timeout. Only Java 21 is raced: a fast
+    # Java 17 mirror must never jump ahead of a slow Java 21 one. If no Java 21 mirror
+    # answers in time, the original order (21 first, then 17) is kept.
+    winner = race_mirrors(candidates_21)
+    if winner:
+        candidates_21 = [winner] + [u for u in candidates_21 if u != winner]
+    candidates = candidates_21 + candidates_17
     last_err = None
     for url in candidates:
         tmpdir = tempfile.mkdtemp(prefix="mc_jre_", dir=tmp_base)
-        archive = os.path.join(tmpdir, "jre.tar.gz")
         try:
             eprint(f"Attempting JRE download from: {url}")
-            download_stream(url, archive)
-            safe_extract_tar_gz(archive, tmpdir)
-            # locate java binary
-            for root, dirs, files in os.walk(tmpdir):
-                if "java" in files and os.access(os.path.join(root, "java"), os.X_OK):
-                    java_bin = os.path.join(root, "java")
-                    # root is typically the 'bin' directory; move parent to install_dir if requested
-                    if install_dir:
-                        parent = os.path.dirname(root)
-                        try:
-                            if os.path.exists(install_dir):
-                                shutil.rmtree(install_dir)
-                            shutil.move(parent, install_dir)
-                            java_bin = os.path.join(install_dir, os.path.relpath(java_bin, parent))
-                            return java_bin
-                        except Exception as ex:
-                            eprint(f"Failed to move JRE into place: {ex}")
-                            return java_bin
-                    return java_bin
+            # extract straight from the response; no temporary archive on disk
+            with http_open(url, timeout=60) as r:
+                java_bin = safe_extract_tar_gz(r, tmpdir)
+            # locate java binary (extraction normally reports it already)
+            if java_bin is None or not os.access(java_bin, os.X_OK):
+                java_bin = find_java_in_tree(tmpdir)
+            if java_bin:
+                # java lives in a 'bin' directory; move its parent to install_dir if requested
+                if install_dir:
+                    parent = os.path.dirname(os.path.dirname(java_bin))
+                    try:
+                        if os.path.exists(install_dir):
+                            shutil.rmtree(install_dir)
+                        move_tree(parent, install_dir)
+                        java_bin = os.path.join(install_dir, os.path.relpath(java_bin, parent))
+                        return java_bin
+                    except Exception as ex:
+                        eprint(f"Failed to move JRE into place: {ex}")
+                        return java_bin
+                return java_bin
             last_err = RuntimeError("JRE downloaded but no java binary found")
         except Exception as ex:
             eprint(f"JRE attempt failed ({url}): {ex}")
@@ -141,51 +474,99 @@ def download_portable_jre_try(tmp_base: str, install_dir: str | None = None) ->
     raise last_err or RuntimeError("All JRE download attempts failed")
 
 
+def _fetch_ip(url: str) -> str | None:
+    with http_open(url, timeout=3) as r:
+        # an address is at most 15 chars; never buffer an arbitrary body
+        ip = r.read(64).decode(errors="replace").strip()
+    try:
+        socket.inet_pton(socket.AF_INET, ip)
+    except (OSError, ValueError):
+        return None
+    return ip
+
+
 def try_get_public_ip() -> str | None:
+    # race the services and take the first valid answer instead of trying them in turn
     services = ["https://api.ipify.org", "https://ifconfig.co/ip", "https://ifconfig.me/ip"]
-    for s in services:
-        try:
-            req = Request(s, headers={"User-Agent": "mc_auto/1.0"})
-            with urlopen(req, timeout=8) as r:
-                ip = r.read().decode().strip()
-                # basic validation
-                parts = ip.split('.')
-                if len(parts) == 4:
-                    return ip
-        except Exception:
-            continue
-    return None
+    return _first_success(_fetch_ip, services)
+
+
+_LAST_BUILD_RE = re.compile(rb'"builds"\s*:\s*\[[^\]]*?(\d+)\s*\]')
+
+CACHE_FILE = ".mc_auto_cache.json"
+PAPER_CACHE_TTL = 24 * 3600
+PUBLIC_IP_CACHE_TTL = 3600
+
+
+def load_cache(install_dir: str) -> dict:
+    """Load the resolver cache (Paper version/build, public IP); empty on any error."""
+    try:
+        with open(os.path.join(install_dir, CACHE_FILE), "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return data if isinstance(data, dict) else {}
+    except Exception:
+        return {}
+
+
+def save_cache(install_dir: str, cache: dict) -> None:
+    path = os.path.join(install_dir, CACHE_FILE)
+    tmp = path + ".tmp"
+    try:
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(cache, f)
+        os.replace(tmp, path)
+    except Exception as ex:
+        eprint(f"Could not write cache {path}: {ex}")
+
+
+def cache_fresh(cache: dict, prefix: str, ttl: float) -> bool:
+    stamp = cache.get(f"{prefix}_time")
+    return isinstance(stamp, (int, float)) and 0 <= time.time() - stamp < ttl
 
 
 def download_paper_fallback(dest: str) -> None:
     # Prefer PaperMC API to resolve version/build. Allow override via PAPER_VERSION.
     # If API download fails, try SERVER_JAR_FALLBACK_URL env var, then the known Paper 1.21.11 URL.
+    cache_dir = os.path.dirname(dest)
+    cache = load_cache(cache_dir)
     env_ver = os.environ.get("PAPER_VERSION")
-    if env_ver:
-        version = env_ver
-    else:
-        try:
-            api = "https://papermc.io/api/v2/projects/paper"
-            req = Request(api, headers={"User-Agent": "mc_auto/1.0"})
-            with urlopen(req, timeout=10) as r:
-                data = json.load(r)
-                versions = data.get("versions") or []
-                version = versions[-1] if versions else "1.21.11"
-        except Exception:
-            version = "1.21.11"
-
+    cached = (cache_fresh(cache, "paper", PAPER_CACHE_TTL) and "paper_build" in cache
+              and (not env_ver or cache.get("paper_version") == env_ver))
     try:
-        builds_url = f"https://papermc.io/api/v2/projects/paper/versions/{version}"
-        req = Request(builds_url, headers={"User-Agent": "mc_auto/1.0"})
-        with urlopen(req, timeout=10) as r:
-            data = json.load(r)
-            builds = data.get("builds") or []
-            if not builds:
-                raise RuntimeError(f"No builds found for Paper version {version}")
-            build = builds[-1]
-            jar_url = f"https://papermc.io/api/v2/projects/paper/versions/{version}/builds/{build}/downloads/paper-{version}-{build}.jar"
-            download_stream(jar_url, dest)
-            return
+        if cached:
+            version = cache["paper_version"]
+            build = cache["paper_build"]
+        else:
+            if env_ver:
+                version = env_ver
+            else:
+                try:
+                    api = "https://papermc.io/api/v2/projects/paper"
+                    with http_open(api, timeout=10) as r:
+                        data = json_loads(r.read())
+                        versions = data.get("versions") or []
+                        version = versions[-1] if versions else "1.21.11"
+                except Exception:
+                    version = "1.21.11"
+
+            builds_url = f"https://papermc.io/api/v2/projects/paper/versions/{version}"
+            with http_open(builds_url, timeout=10) as r:
+                body = r.read()
+            # builds are listed ascending; pick the last one without decoding the document
+            m = _LAST_BUILD_RE.search(body)
+            if m:
+                build = int(m.group(1))
+            else:
+                builds = json_loads(body).get("builds") or []
+                if not builds:
+                    raise RuntimeError(f"No builds found for Paper version {version}")
+                build = builds[-1]
+            cache.update(paper_version=version, paper_build=build, paper_time=time.time())
+            save_cache(cache_dir, cache)
+        # fetch the jar after the metadata response is released so it reuses the connection
+        jar_url = f"https://papermc.io/api/v2/projects/paper/versions/{version}/builds/{build}/downloads/paper-{version}-{build}.jar"
+        download_stream(jar_url, dest)
+        return
     except Exception as ex:
         # Try explicit fallback provided by panel/user
         fallback_env = os.environ.get("SERVER_JAR_FALLBACK_URL")
@@ -199,6 +580,115 @@ def download_paper_fallback(dest: str) -> None:
         download_stream(known_12111, dest)
 
 
+def write_if_changed(path: str, data: bytes, dir_fd: int | None = None) -> bool:
+    """Atomically replace `path` with `data` unless it already holds exactly that.
+
+    With `dir_fd`, `path` is resolved relative to that open directory.
+    """
+    try:
+        fd = os.open(path, os.O_RDONLY, dir_fd=dir_fd)
+    except OSError:
+        pass
+    else:
+        try:
+            if os.read(fd, len(data) + 1) == data:
+                return False
+        finally:
+            os.close(fd)
+    _write_atomic(path, data, dir_fd)
+    return True
+
+
+def _write_all(fd: int, data: bytes) -> None:
+    # os.write may write only part of the buffer (e.g. a pipe interrupted by a signal)
+    view = memoryview(data)
+    while view:
+        view = view[os.write(fd, view):]
+
+
+def _write_atomic(path: str, data: bytes, dir_fd: int | None = None) -> None:
+    tmp = path + ".tmp"
+    fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644, dir_fd=dir_fd)
+    try:
+        _write_all(fd, data)
+    finally:
+        os.close(fd)
+    os.replace(tmp, path, src_dir_fd=dir_fd, dst_dir_fd=dir_fd)
+
+
+def _read_at(path: str, dir_fd: int | None = None) -> bytes | None:
+    try:
+        fd = os.open(path, os.O_RDONLY, dir_fd=dir_fd)
+    except OSError:
+        return None
+    try:
+        chunks = []
+        while True:
+            b = os.read(fd, 1 << 16)
+            if not b:
+                return b"".join(chunks)
+            chunks.append(b)
+    finally:
+        os.close(fd)
+
+
+def update_properties(path: str, managed: dict[str, str], dir_fd: int | None = None) -> bool:
+    """Set the `managed` keys in a .properties file, keeping every other line.
+
+    The server rewrites this file with its own header and defaults on each start,
+    so only our keys are compared; nothing is written when they already match.
+    """
+    existing = _read_at(path, dir_fd)
+    # surrogateescape round-trips any non-UTF-8 bytes untouched
+    text = existing.decode("utf-8", "surrogateescape") if existing is not None else ""
+    pending = dict(managed)
+    lines = text.splitlines(keepends=True)
+    for i, line in enumerate(lines):
+        stripped = line.lstrip()
+        if not stripped or stripped[0] in "#!":
+            continue
+        key = re.split(r"[=:]", stripped, maxsplit=1)[0].strip()
+        if key in pending:
+            value = pending.pop(key)
+            ending = line[len(line.rstrip("\r\n")):] or "\n"
+            lines[i] = f"{key}={value}{ending}"
+    if lines and not lines[-1].endswith(("\n", "\r")):
+        lines[-1] += "\n"
+    lines.extend(f"{key}={value}\n" for key, value in pending.items())
+    data = "".join(lines).encode("utf-8", "surrogateescape")
+    if data == existing:
+        return False
+    _write_atomic(path, data, dir_fd)
+    return True
+
+
+def link_java(pointer: str, java_bin: str) -> None:
+    """Point `pointer` at `java_bin` so later runs can skip Java discovery."""
+    try:
+        if os.path.lexists(pointer):
+            os.remove(pointer)
+        os.symlink(os.path.abspath(java_bin), pointer)
+    except OSError as ex:
+        eprint(f"Could not record Java path in {pointer}: {ex}")
+
+
+_mem_total_kb: int | None = None
+
+
+def mem_total_kb() -> int:
+    """Return MemTotal from /proc/meminfo in kB (0 if unavailable); read once per process."""
+    global _mem_total_kb
+    if _mem_total_kb is None:
+        try:
+            # MemTotal is always the first line: "MemTotal:       16318544 kB"
+            with open("/proc/meminfo", "rb") as mm:
+                head = mm.read(64).split()
+            _mem_total_kb = int(head[1]) if head[:1] == [b"MemTotal:"] else 0
+        except Exception:
+            _mem_total_kb = 0
+    return _mem_total_kb
+
+
 def main(argv: list[str]) -> int:
     # defaults
     install_dir = argv[0] if len(argv) > 0 else os.environ.get("INSTALL_DIR", "/home/container")
@@ -225,24 +715,40 @@ def main(argv: list[str]) -> int:
                 eprint("Automatic Paper download failed:", ex)
                 return 1
 
-    # write eula
-    eula = os.path.join(install_dir, "eula.txt")
-    if not os.path.exists(eula):
-        with open(eula, "w", encoding="utf-8") as f:
-            f.write("eula=true\n")
-
-    # server.properties
     port = os.environ.get("SERVER_PORT") or os.environ.get("PORT") or "25565"
     max_players = os.environ.get("MAX_PLAYERS", "20")
     motd = os.environ.get("MOTD", "Managed by mc_auto")
-    with open(os.path.join(install_dir, "server.properties"), "w", encoding="utf-8") as f:
-        f.write(f"server-port={port}\n")
-        f.write(f"max-players={max_players}\n")
-        f.write(f"motd={motd}\n")
+
+    # open install_dir once and resolve eula.txt / server.properties relative to it
+    dir_fd = None
+    if os.open in os.supports_dir_fd and hasattr(os, "O_DIRECTORY"):
+        dir_fd = os.open(install_dir, os.O_RDONLY | os.O_DIRECTORY)
+    base = "" if dir_fd is not None else install_dir
+    try:
+        # write eula
+        eula = os.path.join(base, "eula.txt")
+        try:
+            os.stat(eula, dir_fd=dir_fd)
+        except FileNotFoundError:
+            write_if_changed(eula, b"eula=true\n", dir_fd=dir_fd)
+
+        # server.properties (left untouched on restarts when the settings are unchanged)
+        managed = {"server-port": port, "max-players": max_players, "motd": motd}
+        update_properties(os.path.join(base, "server.properties"), managed, dir_fd=dir_fd)
+    finally:
+        if dir_fd is not None:
+            os.close(dir_fd)
 
     # ensure Java
-    java_path = shutil.which("java")
     env = None
+    # a JRE installed by a previous run is recorded as a symlink; one access() on the hot path
+    java_pointer = os.path.join(install_dir, ".java_path")
+    if os.access(java_pointer, os.X_OK):
+        java_path = os.path.realpath(java_pointer)
+        env = os.environ.copy()
+        env["PATH"] = os.path.dirname(java_path) + os.pathsep + env.get("PATH", "")
+    else:
+        java_path = shutil.which("java")
     if not java_path:
         # persistent JRE cache location (inside install dir by default)
         jre_cache = os.environ.get("JRE_CACHE_DIR") or os.path.join(install_dir, ".jre")
@@ -250,6 +756,7 @@ def main(argv: list[str]) -> int:
         cached = find_java_in_tree(jre_cache)
         if cached:
             java_path = cached
+            link_java(java_pointer, java_path)
             env = os.environ.copy()
             env["PATH"] = os.path.dirname(java_path) + os.pathsep + env.get("PATH", "")
         else:
@@ -258,16 +765,7 @@ def main(argv: list[str]) -> int:
             # - Otherwise, enable auto-install when total memory >= 1GB (detect via /proc/meminfo).
             auto_env = os.environ.get("AUTO_INSTALL_JRE")
             if auto_env is None:
-                mem_kb = 0
-                try:
-                    with open("/proc/meminfo", "r", encoding="utf-8") as mm:
-                        for ln in mm:
-                            if ln.startswith("MemTotal:"):
-                                parts = ln.split()
-                                mem_kb = int(parts[1])
-                                break
-                except Exception:
-                    mem_kb = 0
+                mem_kb = mem_total_kb()
                 eprint(f"Detected MemTotal: {mem_kb} kB")
                 auto_install = mem_kb >= 1000000
             else:
@@ -278,6 +776,7 @@ def main(argv: list[str]) -> int:
                     tmp_base = "/tmp" if os.path.isdir("/tmp") else install_dir
                     java_bin = download_portable_jre_try(tmp_base, install_dir=jre_cache)
                     java_path = java_bin
+                    link_java(java_pointer, java_path)
                     env = os.environ.copy()
                     env["PATH"] = os.path.dirname(java_path) + os.pathsep + env.get("PATH", "")
                 except Exception as ex:
@@ -291,18 +790,31 @@ def main(argv: list[str]) -> int:
 
     cmd = [java_path, f"-Xms{mem_min}", f"-Xmx{mem_max}", "-jar", server_jar, "nogui"]
     print("Starting server:", " ".join(cmd))
-    proc = subprocess.Popen(cmd, cwd=install_dir, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, bufsize=1, env=env)
-
-    public_ip = try_get_public_ip()
+    # Every fd we open is non-inheritable (PEP 446), so skip the close_fds scan of the
+    # whole fd table; a new session keeps terminal Ctrl-C from hitting the JVM directly
+    # (the KeyboardInterrupt handler below stops it cleanly instead).
+    proc = subprocess.Popen(cmd, cwd=install_dir, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, env=env,
+                            close_fds=False, start_new_session=True)
+
+    cache = load_cache(install_dir)
+    if cache_fresh(cache, "public_ip", PUBLIC_IP_CACHE_TTL):
+        public_ip = cache.get("public_ip")
+    else:
+        public_ip = try_get_public_ip()
+        if public_ip:
+            cache.update(public_ip=public_ip, public_ip_time=time.time())
+            save_cache(install_dir, cache)
     join = f"{public_ip or 'SERVER_IP'}:{port}"
     ready = False
+    # relay raw bytes straight to fd 1: no decode/encode and no flush() per line
+    sys.stdout.flush()
+    out_fd = sys.stdout.fileno()
     try:
         for line in proc.stdout:
-            sys.stdout.write(line)
-            sys.stdout.flush()
-            if not ready and ("Done (" in line or "For help" in line):
+            _write_all(out_fd, line)
+            if not ready and (b"Done (" in line or b"For help" in line):
                 ready = True
-                print(f"\nServer reports ready. Join at: {join}\n")
+                print(f"\nServer reports ready. Join at: {join}\n", flush=True)
         rc = proc.wait()
         print(f"Server exited with code {rc}")
         return rc or 0
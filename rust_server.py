@@ -17,11 +17,12 @@ Flow:
 # ──────────────────────────────────────────────
 # 0.  Auto-install pip dependencies
 # ──────────────────────────────────────────────
-import subprocess, sys, importlib, os
+import subprocess, sys, importlib, importlib.util, os
 from pathlib import Path as _Path
 
 _SCRIPT_DIR = _Path(__file__).resolve().parent
 _PIP_TARGET = str(_SCRIPT_DIR / ".pip_packages")
+_PIP_CACHE  = str(_SCRIPT_DIR / ".pip_cache")
 if _PIP_TARGET not in sys.path:
     sys.path.insert(0, _PIP_TARGET)
 
@@ -29,26 +30,34 @@ REQUIRED_PACKAGES = ["psutil", "requests"]
 
 def install_requirements():
     os.makedirs(_PIP_TARGET, exist_ok=True)
-    for pkg in REQUIRED_PACKAGES:
-        try:
-            importlib.import_module(pkg)
-        except ImportError:
-            print(f"[SETUP] Installing missing package: {pkg}")
-            subprocess.check_call(
-                [sys.executable, "-m", "pip", "install",
-                 "--target", _PIP_TARGET, pkg],
-            )
-            importlib.invalidate_caches()
-            importlib.import_module(pkg)
+    # find_spec only checks availability; the packages are imported lazily where used
+    missing = [pkg for pkg in REQUIRED_PACKAGES if importlib.util.find_spec(pkg) is None]
+    if not missing:
+        return
+    print(f"[SETUP] Installing missing packages: {', '.join(missing)}")
+    # One pip run for everything; wheels are cached next to the script so a
+    # reinstall on a fresh container does not hit the network again.
+    env = dict(os.environ, PIP_CACHE_DIR=os.environ.get("PIP_CACHE_DIR", _PIP_CACHE))
+    subprocess.check_call(
+        [sys.executable, "-m", "pip", "install",
+         "--target", _PIP_TARGET,
+         "--disable-pip-version-check", "--no-input", "--no-compile",
+         *missing],
+        env=env,
+    )
+    importlib.invalidate_caches()
+    for pkg in missing:
+        importlib.import_module(pkg)
 
 install_requirements()
 
 # ──────────────────────────────────────────────
 # Imports (safe after auto-install)
 # ──────────────────────────────────────────────
-import io, time, signal, shutil, zipfile, json
-import textwrap, datetime, threading, random, platform
-import requests, psutil
+# requests, psutil, zipfile and textwrap are imported inside the functions that
+# need them, so a restart that skips the update step never loads them.
+import time, signal, shutil, json, tempfile, codecs, re
+import datetime, threading, random, platform, atexit
 from pathlib import Path
 
 IS_LINUX = platform.system() != "Windows"
@@ -57,36 +66,47 @@ IS_LINUX = platform.system() != "Windows"
 # 1a. Logging – mirror all output to a text file
 # ──────────────────────────────────────────────
 LOG_FILE = Path(__file__).resolve().parent / "server_log.txt"
+LOG_FLUSH_INTERVAL = 2      # seconds between background flushes of the log file
+
+_log_handle = None
 
 
 class _TeeWriter:
     """Write to both the original stream and a log file, adding timestamps."""
 
+    _LINE_START = re.compile(r"^(?=.)", re.MULTILINE)   # start of every non-empty line
+
     def __init__(self, original_stream, log_handle):
         self._original = original_stream
         self._log = log_handle
         self._at_line_start = True
+        self._last_stamp_sec = 0
+        self._last_stamp_str = ""
 
     # ── helpers ──────────────────────────────
     def _stamp(self) -> str:
-        return datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        # formatted once per second, not once per line
+        sec = int(time.time())
+        if sec != self._last_stamp_sec:
+            self._last_stamp_sec = sec
+            self._last_stamp_str = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(sec))
+        return self._last_stamp_str
 
     def write(self, text: str):
         if not text:
             return
         # Write to console unchanged
         self._original.write(text)
-        # Write to log with timestamps at the start of each line
-        lines = text.split("\n")
-        for i, line in enumerate(lines):
-            if self._at_line_start and line:
-                self._log.write(f"[{self._stamp()}] ")
-            self._log.write(line)
-            if i < len(lines) - 1:          # there was a newline
-                self._log.write("\n")
-                self._at_line_start = True
-            else:
-                self._at_line_start = (line == "")
+        # Write to log with timestamps at the start of each line, in a single write
+        prefix = f"[{self._stamp()}] "
+        if self._at_line_start:
+            stamped = self._LINE_START.sub(lambda _: prefix, text)
+        else:
+            # the first fragment continues the previous line
+            head, sep, tail = text.partition("\n")
+            stamped = head + sep + self._LINE_START.sub(lambda _: prefix, tail)
+        self._log.write(stamped)
+        self._at_line_start = text.endswith("\n")
 
     def flush(self):
         self._original.flush()
@@ -97,12 +117,28 @@ class _TeeWriter:
         return getattr(self._original, name)
 
 
+def _flush_log_periodically(log_handle):
+    while True:
+        time.sleep(LOG_FLUSH_INTERVAL)
+        try:
+            log_handle.flush()
+        except (OSError, ValueError):   # closed at interpreter exit
+            return
+
+
 def _setup_logging():
     """Open the log file and redirect stdout + stderr through _TeeWriter."""
-    log_handle = open(LOG_FILE, "a", encoding="utf-8", buffering=1)  # line-buffered
+    global _log_handle
+    # Block-buffered: a flusher thread, atexit and the signal handler push it to disk
+    log_handle = open(LOG_FILE, "a", encoding="utf-8", buffering=1 << 20)
+    os.set_inheritable(log_handle.fileno(), False)   # child processes are started with close_fds=False
     log_handle.write(f"\n{'=' * 60}\n")
     log_handle.write(f"  Log session started: {datetime.datetime.now():%Y-%m-%d %H:%M:%S}\n")
     log_handle.write(f"{'=' * 60}\n")
+    _log_handle = log_handle
+    atexit.register(log_handle.flush)
+    threading.Thread(target=_flush_log_periodically, args=(log_handle,),
+                     name="log-flush", daemon=True).start()
     sys.stdout = _TeeWriter(sys.__stdout__, log_handle)
     sys.stderr = _TeeWriter(sys.__stderr__, log_handle)
 
@@ -130,6 +166,9 @@ else:
 DEPOTDL_REPO = "SteamRE/DepotDownloader"
 RUST_APP_ID  = 258550
 
+GH_CACHE_PATH = DEPOTDL_DIR / ".gh_cache.json"   # cached GitHub release lookup
+GH_CACHE_TTL  = 4 * 3600                        # seconds before re-checking GitHub
+
 # Server launch settings
 SERVER_IDENTITY    = "myserver"
 SERVER_HOSTNAME    = "My Rust Server"
@@ -146,59 +185,185 @@ RCON_PASSWORD      = "changeme"       # RCON password – CHANGE THIS
 RCON_WEB           = 1                # 1 = websocket RCON (required by most panels)
 
 RESTART_DELAY      = 15
+UPDATE_CHECK_TTL   = 4 * 3600         # if the build ID can't be fetched, skip the update if the last check succeeded this recently (0 = always check)
+LAST_UPDATE_PATH   = SCRIPT_DIR / ".last_update"
+BUILDID_PATH       = SERVER_DIR / ".buildid"        # Steam build ID of the installed server
+STEAM_INFO_URL     = f"https://api.steamcmd.net/v1/info/{RUST_APP_ID}"
 MAX_FAST_CRASHES   = 5
 MAX_TOTAL_CRASHES  = 3               # stop after this many consecutive non-zero exits (any uptime)
+HANG_TIMEOUT       = 600             # kill the server after this many seconds at 0% CPU (0 = disabled)
+HANG_CHECK_INTERVAL = 30             # seconds between hang-watchdog samples
 
 # ──────────────────────────────────────────────
 # 2.  DepotDownloader helpers
 # ──────────────────────────────────────────────
+_SESSION = None
+
+
+def _session():
+    """Shared keep-alive HTTP session, created on first use (GitHub requires a
+    User-Agent). Transient errors / rate limits are retried with exponential
+    backoff (0, 4, 8, 16, 32 s – urllib3 does not delay the first retry),
+    honouring Retry-After."""
+    global _SESSION
+    if _SESSION is None:
+        import requests
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+
+        _SESSION = requests.Session()
+        _SESSION.headers.update({"User-Agent": "AutoRustServer/1"})
+        _SESSION.mount("https://", HTTPAdapter(max_retries=Retry(
+            total=5,
+            backoff_factor=2,
+            status_forcelist=(403, 429, 500, 502, 503, 504),
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        )))
+    return _SESSION
+
+
 def get_latest_depotdl_url() -> str:
-    """Query GitHub API for the latest DepotDownloader release asset URL."""
+    """Query GitHub API for the latest DepotDownloader release asset URL.
+
+    The result is cached in GH_CACHE_PATH. Within GH_CACHE_TTL the API is not
+    contacted at all; after that a conditional request is sent, and a 304 reply
+    does not count against GitHub's unauthenticated rate limit.
+    """
+    try:
+        cache = json.loads(GH_CACHE_PATH.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        cache = {}
+    if cache.get("url") and time.time() - cache.get("fetched", 0) < GH_CACHE_TTL:
+        print("[DEPOT] Using cached release info.")
+        return cache["url"]
+
     api = f"https://api.github.com/repos/{DEPOTDL_REPO}/releases/latest"
+    headers = {"Accept": "application/vnd.github+json"}
+    if cache.get("url"):
+        if cache.get("etag"):
+            headers["If-None-Match"] = cache["etag"]
+        if cache.get("last_modified"):
+            headers["If-Modified-Since"] = cache["last_modified"]
     print(f"[DEPOT] Fetching latest release info from GitHub …")
-    r = requests.get(api, timeout=30)
+    r = _session().get(api, headers=headers, timeout=30)
+    if r.status_code == 304 and cache.get("url"):
+        print("[DEPOT] Release info unchanged.")
+        cache["fetched"] = time.time()
+        _save_gh_cache(cache)
+        return cache["url"]
     r.raise_for_status()
     data = r.json()
     for asset in data.get("assets", []):
         if asset["name"] == DEPOTDL_ASSET:
             print(f"[DEPOT] Latest release: {data['tag_name']}  ({asset['name']})")
+            _save_gh_cache({
+                "etag": r.headers.get("ETag"),
+                "last_modified": r.headers.get("Last-Modified"),
+                "url": asset["browser_download_url"],
+                "fetched": time.time(),
+            })
             return asset["browser_download_url"]
     raise RuntimeError(f"Could not find {DEPOTDL_ASSET} in latest release")
 
 
+def _save_gh_cache(cache: dict):
+    try:
+        GH_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        GH_CACHE_PATH.write_text(json.dumps(cache), encoding="utf-8")
+    except OSError as e:
+        print(f"[DEPOT] WARNING – could not write {GH_CACHE_PATH}: {e}")
+
+
+def _direct_asset_url() -> str:
+    return f"https://github.com/{DEPOTDL_REPO}/releases/latest/download/{DEPOTDL_ASSET}"
+
+
+def _download_to(url: str, fileobj):
+    """Stream `url` into `fileobj` in 1 MiB blocks."""
+    print(f"[DEPOT] Downloading {url} …")
+    with _session().get(url, timeout=300, stream=True, allow_redirects=True) as r:
+        r.raise_for_status()
+        r.raw.decode_content = True
+        shutil.copyfileobj(r.raw, fileobj, length=1 << 20)
+
+
+def _extract_zip(zf, dest: Path):
+    """Extract `zf` into `dest` through one reusable 1 MiB buffer."""
+    root = dest.resolve()
+    buf = bytearray(1 << 20)
+    mv = memoryview(buf)
+    for zi in zf.infolist():
+        out = (dest / zi.filename).resolve()
+        if root != out and root not in out.parents:
+            print(f"[DEPOT] WARNING – skipping unsafe archive entry {zi.filename!r}")
+            continue
+        if zi.is_dir():
+            out.mkdir(parents=True, exist_ok=True)
+            continue
+        out.parent.mkdir(parents=True, exist_ok=True)
+        with zf.open(zi) as src, open(out, "wb", buffering=1 << 20) as dst:
+            while (n := src.readinto(mv)):
+                dst.write(mv[:n])
+
+
+def _ensure_executable(path: Path):
+    """Add exec bits to `path` if missing – one stat, and no chmod when already set."""
+    try:
+        mode = os.stat(path).st_mode
+    except FileNotFoundError:
+        return
+    if mode & 0o111 != 0o111:
+        os.chmod(path, mode | 0o755)
+
+
+def _is_depotdl_binary(name: str) -> bool:
+    base, ext = os.path.splitext(name.rsplit("/", 1)[-1])
+    return base.startswith("DepotDownloader") and ext in ("", ".exe")
+
+
 def download_depotdownloader() -> bool:
     """Download and extract DepotDownloader if not present."""
     if DEPOTDL_EXE.exists():
         print("[DEPOT] DepotDownloader already installed.")
         return True
 
+    import zipfile
+
     DEPOTDL_DIR.mkdir(parents=True, exist_ok=True)
+    # Stream the archive into a spooled file: small zips stay in RAM, larger ones
+    # spill to disk instead of being held whole in memory.
+    spool = tempfile.SpooledTemporaryFile(max_size=16 << 20)
     try:
-        url = get_latest_depotdl_url()
-        print(f"[DEPOT] Downloading {url} …")
-        r = requests.get(url, timeout=300)
-        r.raise_for_status()
+        # The /releases/latest/download/ link is not rate-limited like the API,
+        # so only ask the API for the asset URL if it fails.
+        try:
+            _download_to(_direct_asset_url(), spool)
+        except Exception as e:
+            print(f"[DEPOT] Direct download failed ({e}) – asking the GitHub API …")
+            spool.seek(0)
+            spool.truncate()
+            _download_to(get_latest_depotdl_url(), spool)
+        spool.seek(0)
     except Exception as e:
+        spool.close()
         print(f"[DEPOT] ERROR downloading DepotDownloader: {e}")
         return False
 
-    buf = io.BytesIO(r.content)
-    with zipfile.ZipFile(buf) as zf:
-        zf.extractall(DEPOTDL_DIR)
+    with spool, zipfile.ZipFile(spool) as zf:
+        # Locate the binary from the archive listing (some releases nest it)
+        # rather than scanning the extracted tree afterwards.
+        binaries = [zi.filename for zi in zf.infolist()
+                    if not zi.is_dir() and _is_depotdl_binary(zi.filename)]
+        main_entry = min(binaries, key=lambda n: n.count("/"), default=None)
+        _extract_zip(zf, DEPOTDL_DIR)
+
+    if main_entry and not DEPOTDL_EXE.exists():
+        shutil.move(str(DEPOTDL_DIR / main_entry), str(DEPOTDL_EXE))
 
     # Make executable on Linux
     if IS_LINUX:
-        for f in DEPOTDL_DIR.iterdir():
-            if f.is_file() and not f.suffix:
-                f.chmod(0o755)
-
-    if not DEPOTDL_EXE.exists():
-        # Some releases nest files – search for the binary
-        for f in DEPOTDL_DIR.rglob("DepotDownloader*"):
-            if f.is_file() and (f.suffix == "" or f.suffix == ".exe"):
-                shutil.move(str(f), str(DEPOTDL_EXE))
-                DEPOTDL_EXE.chmod(0o755)
-                break
+        _ensure_executable(DEPOTDL_EXE)
 
     print(f"[DEPOT] Extracted to {DEPOTDL_DIR}")
     return DEPOTDL_EXE.exists()
@@ -217,11 +382,34 @@ def run_depotdownloader(app_id: int, install_dir: Path) -> bool:
             cmd,
             stdout=subprocess.PIPE,
             stderr=subprocess.STDOUT,
-            text=True,
-            bufsize=1,
+            bufsize=1 << 16,
+            close_fds=False,
         )
-        for line in proc.stdout:
-            print(f"  {line}", end="")
+        # Forward whatever is available per read instead of line by line;
+        # output stays indented by two spaces. Line endings are normalised to
+        # "\n" like a text-mode pipe would; a trailing "\r" is held back in case
+        # its "\n" arrives with the next read.
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        at_line_start = True
+        pending = ""
+        while True:
+            chunk = proc.stdout.read1(1 << 16)
+            final = not chunk
+            text = pending + decoder.decode(chunk, final=final)
+            pending = ""
+            if text.endswith("\r") and not final:
+                text, pending = text[:-1], "\r"
+            text = text.replace("\r\n", "\n").replace("\r", "\n")
+            if text:
+                indented = text.replace("\n", "\n  ")
+                if text.endswith("\n"):
+                    indented = indented[:-2]
+                if at_line_start:
+                    indented = "  " + indented
+                at_line_start = text.endswith("\n")
+                sys.stdout.write(indented)
+            if final:
+                break
         proc.wait()
     except Exception as e:
         print(f"[UPDATE] ERROR: {e}")
@@ -236,16 +424,59 @@ def run_depotdownloader(app_id: int, install_dir: Path) -> bool:
 # ──────────────────────────────────────────────
 # 3.  Install / Update Rust server
 # ──────────────────────────────────────────────
+def get_remote_buildid() -> str | None:
+    """Public-branch build ID of the Rust server according to api.steamcmd.net."""
+    import requests
+
+    # Optional shortcut: one quick attempt, no retry adapter – on any failure
+    # the normal DepotDownloader check runs straight away.
+    try:
+        r = requests.get(STEAM_INFO_URL, timeout=5, headers={"User-Agent": "AutoRustServer/1"})
+        r.raise_for_status()
+        return str(r.json()["data"][str(RUST_APP_ID)]["depots"]["branches"]["public"]["buildid"])
+    except Exception as e:
+        print(f"[UPDATE] Could not query current build ID ({e}).")
+        return None
+
+
+def _read_local_buildid() -> str | None:
+    try:
+        return BUILDID_PATH.read_text(encoding="utf-8").strip()
+    except OSError:
+        return None
+
+
 def install_or_update_server() -> bool:
     """Download / update the Rust dedicated server via DepotDownloader."""
+    if os.environ.get("SKIP_ASSET_DOWNLOAD") == "1" and RUST_SERVER_EXE.exists():
+        print("[UPDATE] SKIP_ASSET_DOWNLOAD=1 – skipping update check.\n")
+        return True
+    print("[UPDATE] Checking for Rust server updates …")
+    # The build-ID comparison is cheap, so it runs on every start – a restart right
+    # after a Rust release must pick the update up. The TTL only applies when the
+    # build ID cannot be fetched.
+    remote_build = get_remote_buildid()
+    if RUST_SERVER_EXE.exists():
+        if remote_build:
+            if _read_local_buildid() == remote_build:
+                LAST_UPDATE_PATH.touch()
+                print(f"[UPDATE] Installed build {remote_build} is current – skipping DepotDownloader.\n")
+                return True
+        elif LAST_UPDATE_PATH.exists():
+            age = time.time() - LAST_UPDATE_PATH.stat().st_mtime
+            if 0 <= age < UPDATE_CHECK_TTL:
+                print(f"[UPDATE] Last update check was {age / 60:.0f} min ago – skipping.\n")
+                return True
     if not download_depotdownloader():
         return False
     SERVER_DIR.mkdir(parents=True, exist_ok=True)
-    print("[UPDATE] Checking for Rust server updates …")
     ok = run_depotdownloader(RUST_APP_ID, SERVER_DIR)
-    if ok and IS_LINUX and RUST_SERVER_EXE.exists():
-        RUST_SERVER_EXE.chmod(0o755)
+    if ok and IS_LINUX:
+        _ensure_executable(RUST_SERVER_EXE)
     if ok:
+        LAST_UPDATE_PATH.touch()
+        if remote_build:
+            BUILDID_PATH.write_text(remote_build, encoding="utf-8")
         print("[UPDATE] Rust server is up to date.\n")
     else:
         print("[UPDATE] Update failed – see errors above.\n")
@@ -255,6 +486,8 @@ def install_or_update_server() -> bool:
 # 4.  Server configuration helpers
 # ──────────────────────────────────────────────
 def write_server_cfg():
+    import textwrap
+
     cfg_dir = SERVER_DIR / "server" / SERVER_IDENTITY / "cfg"
     cfg_dir.mkdir(parents=True, exist_ok=True)
     cfg_file = cfg_dir / "server.cfg"
@@ -275,8 +508,7 @@ def write_server_cfg():
     print(f"[CONFIG] Wrote {cfg_file}")
 
 
-def build_server_env() -> dict:
-    """Build environment variables for the Rust server process."""
+def _compute_server_env() -> dict:
     env = os.environ.copy()
     if IS_LINUX:
         # Rust server needs LD_LIBRARY_PATH to find its native .so plugins
@@ -287,12 +519,10 @@ def build_server_env() -> dict:
         ]
         existing = env.get("LD_LIBRARY_PATH", "")
         env["LD_LIBRARY_PATH"] = ":".join(extra_paths + ([existing] if existing else []))
-        print(f"[SERVER] LD_LIBRARY_PATH = {env['LD_LIBRARY_PATH']}")
     return env
 
 
-def build_launch_args() -> list[str]:
-    seed = SERVER_SEED if SERVER_SEED != 0 else random.randint(1, 2147483647)
+def _compute_launch_args_template() -> list[str]:
     args = [
         str(RUST_SERVER_EXE),
         "-batchmode",
@@ -301,7 +531,7 @@ def build_launch_args() -> list[str]:
         "+server.port", str(SERVER_PORT),
         "+server.queryport", str(SERVER_PORT),   # same as game port (single-port setup)
         "+server.level", SERVER_MAP,
-        "+server.seed", str(seed),
+        "+server.seed", "",                       # filled in per launch
         "+server.worldsize", str(SERVER_WORLDSIZE),
         "+server.maxplayers", str(SERVER_MAXPLAYERS),
         "+server.hostname", SERVER_HOSTNAME,
@@ -317,17 +547,43 @@ def build_launch_args() -> list[str]:
         args += ["-logfile", "/dev/stdout"]
     return args
 
+
+# The configuration is constant for the life of the manager, so the environment
+# and launch arguments are built once rather than on every restart.
+_SERVER_ENV = _compute_server_env()
+_LAUNCH_ARGS_TEMPLATE = _compute_launch_args_template()
+_SEED_INDEX = _LAUNCH_ARGS_TEMPLATE.index("+server.seed") + 1
+
+
+def build_server_env() -> dict:
+    """Environment variables for the Rust server process (shared, do not mutate)."""
+    if IS_LINUX:
+        print(f"[SERVER] LD_LIBRARY_PATH = {_SERVER_ENV['LD_LIBRARY_PATH']}")
+    return _SERVER_ENV
+
+
+def build_launch_args() -> tuple[list[str], int]:
+    """Return the launch arguments and the seed they use."""
+    seed = SERVER_SEED if SERVER_SEED != 0 else random.randint(1, 2147483647)
+    args = list(_LAUNCH_ARGS_TEMPLATE)
+    args[_SEED_INDEX] = str(seed)
+    return args, seed
+
 # ──────────────────────────────────────────────
 # 5.  Process management
 # ──────────────────────────────────────────────
 server_process = None
 shutdown_requested = False
+_shutdown_evt = threading.Event()     # set with shutdown_requested; wakes up waits in main()
 
 
 def signal_handler(sig, frame):
     global shutdown_requested
     print("\n[MANAGER] Shutdown requested – stopping server …")
+    if _log_handle is not None:
+        _log_handle.flush()
     shutdown_requested = True
+    _shutdown_evt.set()
     if server_process and server_process.poll() is None:
         server_process.terminate()
         try:
@@ -344,25 +600,55 @@ else:
 
 
 def start_server() -> subprocess.Popen:
-    args = build_launch_args()
+    args, seed = build_launch_args()
     env  = build_server_env()
-    seed_display = args[args.index("+server.seed") + 1] if "+server.seed" in args else "?"
     print("[SERVER] Launching Rust server …")
     print(f"[SERVER]   Port : {SERVER_PORT}")
-    print(f"[SERVER]   Map  : {SERVER_MAP} | Size {SERVER_WORLDSIZE} | Seed {seed_display}")
+    print(f"[SERVER]   Map  : {SERVER_MAP} | Size {SERVER_WORLDSIZE} | Seed {seed}")
     sys.stdout.flush()
     # Let the server inherit stdout/stderr directly – avoids pipe deadlocks
     # and lets Pterodactyl / the terminal see output in real time.
+    # Our own fds (log file, sockets) are non-inheritable, so skip close_fds'
+    # scan of the whole fd table on every (re)start.
     proc = subprocess.Popen(
         args,
         cwd=str(SERVER_DIR),
         env=env,
+        close_fds=False,
     )
     print(f"[SERVER] PID {proc.pid} started at {datetime.datetime.now():%Y-%m-%d %H:%M:%S}\n")
     sys.stdout.flush()
     return proc
 
 
+def watch_for_hang(proc: subprocess.Popen):
+    """Terminate `proc` if it uses no CPU for HANG_TIMEOUT seconds (deadlocked server)."""
+    import psutil
+
+    try:
+        p = psutil.Process(proc.pid)
+        p.cpu_percent(None)             # prime the counter
+    except psutil.NoSuchProcess:
+        return
+    idle = 0
+    while proc.poll() is None and not shutdown_requested:
+        time.sleep(HANG_CHECK_INTERVAL)
+        try:
+            cpu = p.cpu_percent(None)
+            rss = p.memory_info().rss
+        except psutil.NoSuchProcess:
+            return
+        idle = idle + HANG_CHECK_INTERVAL if cpu == 0.0 else 0
+        if idle >= HANG_TIMEOUT and proc.poll() is None:
+            print(f"[MANAGER] Hang detected – 0% CPU for {idle}s (RSS {rss // (1 << 20)} MB). Terminating server …")
+            proc.terminate()
+            try:
+                proc.wait(timeout=30)
+            except subprocess.TimeoutExpired:
+                proc.kill()
+            return
+
+
 # ──────────────────────────────────────────────
 # 6.  Main loop
 # ──────────────────────────────────────────────
@@ -395,9 +681,14 @@ def main():
         start_time = time.time()
 
         server_process = start_server()
+        if HANG_TIMEOUT:
+            threading.Thread(target=watch_for_hang, args=(server_process,),
+                             name="hang-watchdog", daemon=True).start()
 
-        server_process.wait()
-        exit_code = server_process.returncode
+        while server_process.poll() is None:
+            if _shutdown_evt.wait(1):
+                break
+        exit_code = server_process.poll()
         elapsed = time.time() - start_time
         print(f"\n[MANAGER] Server exited with code {exit_code} at "
               f"{datetime.datetime.now():%Y-%m-%d %H:%M:%S}  (ran {elapsed:.0f}s)")
@@ -436,7 +727,8 @@ def main():
             consecutive_crashes = 0     # clean exit (code 0) resets the counter
 
         print(f"[MANAGER] Restarting in {RESTART_DELAY}s – checking for updates first …\n")
-        time.sleep(RESTART_DELAY)
+        if _shutdown_evt.wait(RESTART_DELAY):
+            break
         install_or_update_server()
         write_server_cfg()
 